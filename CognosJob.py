@@ -11,6 +11,12 @@ import io
 from docx import Document
 import re
 import urllib3
+# --- Imports Adicionais para Buscas Salvas ---
+import time
+from datetime import datetime
+from saved_searches import SavedSearchWorker, content_hash, load_saved_searches, update_saved_searches
+# --- Extração de Vagas (requests -> Chromium headless local -> Jina) ---
+from scraper import PLAYWRIGHT_AVAILABLE, SITE_RULES, BrowserRenderPool, fetch_job_text
 # --- CONFIGURAÇÃO E ESTILO ---
 st.set_page_config(page_title="Cognos Job AI Pro", page_icon="⚡", layout="wide")
 
@@ -78,177 +84,42 @@ for key in keys_to_initialize:
             st.session_state[key] = None
 
 # --- FUNÇÕES DE NÚCLEO (COM CACHE) ---
-@st.cache_data(show_spinner="Buscando vagas no Google...")
-def util_google_search(query, api_key, cx_id):
-    """Executa a busca via Google Custom Search API."""
+def fetch_google_results(query, api_key, cx_id):
+    """Executa a busca via Google Custom Search API (sem cache, usada pelo polling). Retorna None em caso de erro."""
     try:
         service = build("customsearch", "v1", developerKey=api_key)
         res = service.cse().list(q=query, cx=cx_id, num=10, sort='date').execute()
         return res.get('items', [])
     except Exception as e:
         st.error(f"Erro na API do Google: {e}")
-        return []
-
-
-
-@st.cache_data(show_spinner="Lendo conteúdo da vaga com IA Reader...")
-
-def clean_html_noise(soup):
-    """
-    Remove poluição visual com lógica baseada em CONTEÚDO, não só classes.
-    """
-    # 1. Remove tags estruturais inúteis para IA
-    for element in soup(['script', 'style', 'noscript', 'iframe', 'svg', 'header', 'footer', 'nav', 'aside', 'form', 'button']):
-        element.decompose()
-
-    # 2. COOKIE NUKE: Remove elementos que contenham texto de consentimento
-    # Isso resolve o problema do seu Print 1
-    blacklist_phrases = ['utilizamos cookies', 'sua privacidade', 'aceitar todos', 'política de privacidade', 'configurações de cookies']
-    
-    # Varre divs, sections e spans
-    for tag in soup.find_all(['div', 'section', 'span', 'p', 'aside']):
-        # Se o texto for curto (banner) e tiver palavras chave de cookie
-        text_content = tag.get_text(" ", strip=True).lower()
-        if len(text_content) < 400 and any(phrase in text_content for phrase in blacklist_phrases):
-            tag.decompose()
+        return None
 
-    return soup
+@st.cache_data(show_spinner="Buscando vagas no Google...")
+def util_google_search(query, api_key, cx_id):
+    """Executa a busca via Google Custom Search API."""
+    return fetch_google_results(query, api_key, cx_id)
 
-@st.cache_data(show_spinner="Acessando site e quebrando proteções...")
-def scrape_job_description(url):
-    """
-    Extração Resiliente: Foca em trazer TEXTO, ignorando formatação se necessário.
-    """
-    extracted_text = ""
-    
-    # Headers simulando um Chrome real no Windows
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-        'Accept-Language': 'pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7',
-        'Connection': 'keep-alive',
-        'Upgrade-Insecure-Requests': '1',
-    }
+def build_dork_query(cargo, local):
+    """Monta a Dork otimizada para evitar agregadores de spam."""
+    return f'intitle:"{cargo}" "{local if local else ""}" (site:gupy.io OR site:linkedin.com/jobs OR site:glassdoor.com.br OR site:greenhouse.io OR site:lever.co) -inurl:login'
 
+@st.cache_resource(show_spinner="Aquecendo navegador headless...")
+def get_render_pool(site_rules=SITE_RULES):
+    """Cria o pool uma única vez por processo. Retorna None se o Playwright/Chromium não estiver disponível."""
+    if not PLAYWRIGHT_AVAILABLE:
+        return None
     try:
-        # verify=False pula erros de SSL que bloqueiam muitos scrapers
-        response = requests.get(url, headers=headers, timeout=20, verify=False)
-        
-        # Detecção automática de encoding (resolve caracteres estranhos)
-        response.encoding = response.apparent_encoding
-        
-        if response.status_code != 200:
-            return f"Erro ao acessar site: Status {response.status_code}"
-
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # 1. Limpeza Pesada (Remove o banner de cookie)
-        soup = clean_html_noise(soup)
-        
-        # 2. Estratégia de Extração "Rede de Arrasto"
-        # Em vez de tentar achar o container perfeito, vamos pegar todo texto relevante
-        # Sites como o da Solor usam 'accordions', o texto está lá, só escondido no CSS.
-        # O BeautifulSoup VÊ o texto escondido, nós só precisamos pegar.
-        
-        text_blocks = []
-        # Pega parágrafos, itens de lista e divs de texto
-        for tag in soup.find_all(['p', 'li', 'h1', 'h2', 'h3', 'div']):
-            text = tag.get_text(" ", strip=True)
-            # Filtra linhas muito curtas ou vazias
-            if len(text) > 30: 
-                text_blocks.append(text)
-
-        # Remove duplicatas mantendo a ordem
-        seen = set()
-        clean_blocks = [x for x in text_blocks if not (x in seen or seen.add(x))]
-        
-        extracted_text = "\n\n".join(clean_blocks)
-
+        return BrowserRenderPool(site_rules=site_rules)
     except Exception as e:
-        return f"Erro crítico na extração: {str(e)}. Tente copiar e colar manual."
-
-    # Validação Final
-    if len(extracted_text) < 100:
-        # Fallback para Jina se o requests falhar
-        try:
-            return requests.get(f"https://r.jina.ai/{url}", timeout=10).text
-        except:
-            return "⚠️ O site bloqueou o acesso ou o conteúdo é gerado 100% via Javascript complexo. Por favor, copie o texto da vaga e cole na aba 'Texto Manual'."
-        
-    return extracted_text
+        print(f"Renderizador local indisponível: {e}")
+        return None
 
 @st.cache_data(show_spinner="Web Specter extraindo dados...")
 def scrape_job_description(url):
-    """
-    Extração Híbrida v2.0:
-    Tenta Jina (bom para JS) -> Se falhar ou vier sujo -> Usa Requests com headers Black + Limpeza Cirúrgica.
-    """
-    extracted_text = ""
-    
-    # --- TENTATIVA 1: Lógica Manual Robustecida (Prioridade para limpeza local) ---
-    # Motivo: O Jina às vezes traz o banner de cookie renderizado. Nossa limpeza local é mais segura.
-    try:
-        # Headers anti-bloqueio (Black Edition)
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Sec-Fetch-User': '?1'
-        }
-        
-        response = requests.get(url, headers=headers, timeout=15)
-        
-        # Se der erro 403/401 (bloqueio), pula para o Jina
-        if response.status_code in [403, 401, 503]:
-            raise Exception("Bloqueio de WAF detectado")
-
-        response.encoding = response.apparent_encoding # Corrige acentuação
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # 1. Limpa o lixo (Cookies, Menus)
-        soup = clean_html_noise(soup)
-        
-        # 2. Encontra o bloco exato da vaga
-        content_block = find_job_content(soup)
-        
-        # 3. Formata o texto final
-        lines = []
-        for line in content_block.get_text("\n").splitlines():
-            clean_line = line.strip()
-            # Filtra linhas inúteis que sobraram
-            if len(clean_line) > 2 and clean_line.lower() not in ["aceitar", "fechar", "voltar"]:
-                lines.append(clean_line)
-        
-        extracted_text = "\n".join(lines)
-
-    except Exception as e:
-        print(f"Método local falhou ou foi bloqueado: {e}. Tentando Jina...")
-        extracted_text = "" # Força fallback
-
-    # --- TENTATIVA 2: Fallback para Jina Reader (Se o local falhar) ---
-    if not extracted_text or len(extracted_text) < 150:
-        try:
-            jina_url = f"https://r.jina.ai/{url}"
-            # Headers simples para o Jina
-            jheaders = {'User-Agent': 'Mozilla/5.0', 'X-Return-Format': 'markdown'}
-            r = requests.get(jina_url, headers=jheaders, timeout=20)
-            if r.status_code == 200:
-                # Mesmo com Jina, tentamos limpar banners comuns
-                raw_text = r.text
-                if "cookie" not in raw_text[:200].lower():
-                    extracted_text = raw_text
-        except:
-            pass
-
-    # Validação Final
-    if len(extracted_text) < 100:
+    """Extração com cache para a interface; devolve um aviso se o site não pôde ser lido."""
+    extracted_text = fetch_job_text(url, get_render_pool())
+    if extracted_text is None:
         return "⚠️ Não foi possível extrair o texto automaticamente (Site protegido ou conteúdo 100% JS). Por favor, copie e cole o texto manualmente na aba ao lado."
-        
     return extracted_text
 
 def get_gemini_response(prompt, api_key, model_name="gemini-2.5-pro"):
@@ -265,6 +136,13 @@ def get_gemini_response(prompt, api_key, model_name="gemini-2.5-pro"):
         st.error(f"Erro na API do Gemini: {e}")
         return None
 
+# --- BUSCAS SALVAS (POLLING INCREMENTAL) ---
+@st.cache_resource
+def get_saved_search_worker():
+    """Worker único por processo que faz o polling das buscas salvas fora do thread da interface."""
+    render_pool = get_render_pool()
+    return SavedSearchWorker(fetch_fn=lambda url: fetch_job_text(url, render_pool))
+
 # --- FUNÇÕES AUXILIARES PARA GERAÇÃO DE ARQUIVOS ---
 def create_docx(content, title):
     """Cria um documento DOCX em memória a partir de um texto."""
@@ -395,7 +273,7 @@ with tab_busca:
                 st.warning("⚠️ Digite um cargo.")
             else:
                 # Dork Otimizada para evitar agregadores de spam
-                dork_query = f'intitle:"{cargo}" "{local if local else ""}" (site:gupy.io OR site:linkedin.com/jobs OR site:glassdoor.com.br OR site:greenhouse.io OR site:lever.co) -inurl:login'
+                dork_query = build_dork_query(cargo, local)
                 
                 results = util_google_search(dork_query, g_key_val, g_cx_val)
                 if results:
@@ -430,6 +308,100 @@ with tab_busca:
                                 st.toast("Vaga carregada e lida com sucesso!", icon="🚀")
                                 st.rerun()
 
+    # --- SEÇÃO 1.1: BUSCAS SALVAS & NOVIDADES ---
+    saved_data = load_saved_searches()
+    g_key_val = st.session_state.get('g_key')
+    g_cx_val = st.session_state.get('g_cx')
+
+    # Agendador: o worker em segundo plano reexecuta as buscas vencidas; a página só lê o arquivo
+    saved_search_worker = get_saved_search_worker()
+    if g_key_val and g_cx_val:
+        saved_search_worker.configure(g_key_val, g_cx_val, st.session_state.get('gem_key'), st.session_state.get('user_cv'))
+
+    with st.expander(f"⏰ Buscas Salvas & Novidades ({len(saved_data['feed'])})", expanded=bool(saved_data['feed'])):
+        with st.form("saved_search_form", clear_on_submit=True):
+            col1, col2, col3 = st.columns([2, 2, 1])
+            with col1:
+                saved_cargo = st.text_input("Cargo / Keywords:", placeholder="Ex: Python Developer Pleno Gupy")
+            with col2:
+                saved_local = st.text_input("Localização:", placeholder="Ex: Brasil (Remoto)")
+            with col3:
+                saved_interval = st.number_input("A cada (horas):", min_value=1, max_value=168, value=24)
+            submit_saved = st.form_submit_button("⭐ Salvar Busca", use_container_width=True)
+
+        if submit_saved:
+            if not saved_cargo:
+                st.warning("⚠️ Digite um cargo.")
+            else:
+                new_search = {
+                    'id': content_hash(saved_cargo, saved_local, str(time.time()))[:12],
+                    'cargo': saved_cargo,
+                    'local': saved_local,
+                    'query': build_dork_query(saved_cargo, saved_local),
+                    'interval_hours': int(saved_interval),
+                    'last_run': None,
+                }
+                update_saved_searches(lambda d: d['searches'].append(new_search))
+                st.rerun()
+
+        for search in saved_data['searches']:
+            col_info, col_action = st.columns([4, 1])
+            with col_info:
+                last_run = datetime.fromtimestamp(search['last_run']).strftime('%d/%m %H:%M') if search.get('last_run') else 'nunca'
+                st.markdown(f"**{search['cargo']}** {search.get('local') or ''}")
+                st.caption(f"A cada {search['interval_hours']}h • Última execução: {last_run}")
+            with col_action:
+                if st.button("🗑️ Remover", key=f"btn_del_saved_{search['id']}", use_container_width=True):
+                    def remove_search(d, search_id=search['id']):
+                        d['searches'] = [s for s in d['searches'] if s['id'] != search_id]
+                        d['feed'] = [f for f in d['feed'] if f['search_id'] != search_id]
+                    update_saved_searches(remove_search)
+                    st.rerun()
+
+        if saved_data['searches']:
+            if saved_search_worker.is_polling:
+                st.caption("🔄 Verificando as buscas salvas em segundo plano... clique em 'Atualizar Feed' para ver as novidades.")
+            col_poll, col_refresh, col_clear = st.columns(3)
+            with col_poll:
+                if st.button("🔄 Verificar Agora", use_container_width=True):
+                    if not g_key_val or not g_cx_val:
+                        st.warning("⚠️ Configure as chaves do Google na sidebar.")
+                    else:
+                        saved_search_worker.poll_now()
+                        st.toast("Verificação iniciada em segundo plano.", icon="🔄")
+            with col_refresh:
+                if st.button("♻️ Atualizar Feed", use_container_width=True):
+                    st.rerun()
+            with col_clear:
+                if st.button("🧹 Limpar Novidades", use_container_width=True):
+                    update_saved_searches(lambda d: d.update(feed=[]))
+                    st.rerun()
+
+        # Feed "novas desde a última execução": só o delta, já lido e ranqueado
+        if saved_data['feed']:
+            st.markdown("### 🆕 Novidades das Buscas Salvas")
+            for i, r in enumerate(saved_data['feed']):
+                with st.container():
+                    col_info, col_action = st.columns([4, 1])
+                    with col_info:
+                        badge = f" • **{r['score']}%**" if r.get('score') is not None else ""
+                        st.markdown(f"**[{r.get('title')}]({r.get('link')})**{badge}")
+                        found_at = datetime.fromtimestamp(r['found_at']).strftime('%d/%m %H:%M')
+                        st.caption(f"{'🆕 Nova' if r['status'] == 'nova' else '✏️ Alterada'} em {found_at} • {r.get('displayLink')} • {r.get('snippet')[:100]}...")
+                    with col_action:
+                        # A descrição já foi extraída no polling: não há novo scrape
+                        if st.button("Analisar ⚡", key=f"btn_feed_{i}", use_container_width=True):
+                            st.session_state.selected_job = {k: r[k] for k in ('title', 'link', 'displayLink', 'snippet')}
+                            st.session_state.job_description = r['description']
+                            # Reset de estados
+                            st.session_state.analysis_result = None
+                            st.session_state.cv_text_out = None
+                            st.session_state.cl_text_out = None
+                            st.session_state.inst_out = None
+
+                            st.toast("Vaga carregada e lida com sucesso!", icon="🚀")
+                            st.rerun()
+
     st.markdown("---")
 
     # --- SEÇÃO 2: LINK OU TEXTO MANUAL ---
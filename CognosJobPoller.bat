@@ -0,0 +1 @@
+python saved_searches.py
\ No newline at end of file
@@ -0,0 +1,361 @@
+# Arquivo/Snippet [saved_searches.py]:
+# Buscas salvas com polling incremental: só vagas novas ou alteradas passam por scrape -> rank -> score.
+# Sem dependência do Streamlit: busca, extração e pontuação são funções injetadas.
+# Roda em segundo plano dentro do app (SavedSearchWorker) ou sozinho, agendado pelo
+# Agendador de Tarefas/cron: python saved_searches.py --cv curriculo.txt
+import argparse
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Arquivo onde ficam as buscas salvas, as vagas já vistas e o feed de novidades
+SAVED_SEARCHES_FILE = "saved_searches.json"
+# Parâmetros de rastreamento que não mudam a vaga (ignorados na URL canônica)
+TRACKING_PARAMS = {'ref', 'refid', 'trackingid', 'trk', 'src', 'source', 'gclid', 'fbclid', 'jobboardsource'}
+# Limite de vagas novas pontuadas pelo Gemini por execução (o resto fica só com o ranking local)
+SAVED_SEARCH_MAX_SCORED = 5
+FEED_MAX_ITEMS = 100
+# Após erro na API do Google, espera este tempo antes de tentar a busca de novo automaticamente
+POLL_RETRY_MINUTES = 15
+# Vagas vistas há mais tempo que isso são relidas mesmo com o snippet do Google igual
+CONTENT_RECHECK_HOURS = 72
+# Tentativas de pontuação por vaga (falhas do Gemini não ficam sendo repetidas para sempre)
+SCORE_MAX_ATTEMPTS = 3
+# Intervalo com que o worker em segundo plano confere se alguma busca venceu
+POLL_TICK_SECONDS = 60
+# Mesmo arquivo de chaves salvo pela sidebar do app
+KEYS_FILE = "user_keys.json"
+
+# Serializa reler -> alterar -> salvar do arquivo entre as sessões/threads do processo
+_FILE_LOCK = threading.RLock()
+# Garante um único polling por vez no processo (duas sessões não gastam a mesma cota duas vezes)
+_POLL_LOCK = threading.Lock()
+
+def canonicalize_url(url):
+    """Normaliza a URL da vaga: host minúsculo, sem fragmento, barra final ou parâmetros de rastreamento."""
+    parts = urlsplit(url.strip())
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if not k.lower().startswith('utm_') and k.lower() not in TRACKING_PARAMS]
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(sorted(query)), ''))
+
+def content_hash(*parts):
+    """Hash estável do conteúdo, ignorando caixa e espaços em branco."""
+    normalized = " ".join(" ".join(p.split()).lower() for p in parts if p)
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+def load_saved_searches(path=SAVED_SEARCHES_FILE):
+    """Carrega buscas salvas, vagas vistas e feed do arquivo JSON."""
+    data = {}
+    if os.path.exists(path):
+        with _FILE_LOCK:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if not isinstance(data, dict):
+                    raise ValueError("conteúdo não é um objeto JSON")
+            except ValueError as e:
+                # Arquivo corrompido: preserva como .bak em vez de sobrescrever as buscas com dados vazios
+                backup = f"{path}.bak"
+                os.replace(path, backup)
+                print(f"{path} inválido ({e}). Cópia preservada em {backup}.")
+                data = {}
+    data.setdefault('searches', [])
+    data.setdefault('seen', {})
+    data.setdefault('feed', [])
+    return data
+
+def save_saved_searches(data, path=SAVED_SEARCHES_FILE):
+    """Salva buscas salvas, vagas vistas e feed no arquivo JSON (escrita atômica: arquivo temporário + os.replace)."""
+    tmp_file = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with _FILE_LOCK:
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, path)
+
+def update_saved_searches(change, path=SAVED_SEARCHES_FILE):
+    """Relê o arquivo, aplica change(data) e salva, tudo sob o lock. Retorna os dados salvos."""
+    with _FILE_LOCK:
+        data = load_saved_searches(path)
+        change(data)
+        save_saved_searches(data, path)
+        return data
+
+def _set_search_fields(data, search_id, **fields):
+    """Atualiza campos de uma busca salva (valor None remove o campo). Ignora buscas já removidas."""
+    for search in data['searches']:
+        if search['id'] == search_id:
+            for key, value in fields.items():
+                if value is None:
+                    search.pop(key, None)
+                else:
+                    search[key] = value
+
+def _record_posting(data, canonical, seen_entry, posting=None):
+    """Marca a vaga como vista e, se houver novidade, coloca no topo do feed."""
+    data['seen'][canonical] = seen_entry
+    if posting:
+        old_feed = [f for f in data['feed'] if f.get('canonical') != canonical]
+        data['feed'] = ([posting] + old_feed)[:FEED_MAX_ITEMS]
+
+def _set_feed_score(data, canonical, score):
+    for item in data['feed']:
+        if item.get('canonical') == canonical:
+            item['score'] = score
+            item['score_attempts'] = item.get('score_attempts', 0) + 1
+
+def rank_by_cv(postings, cv):
+    """Ranking local (sem custo de API): quantidade de termos em comum entre vaga e currículo."""
+    cv_terms = set(re.findall(r'\w{4,}', (cv or '').lower()))
+    for posting in postings:
+        job_terms = set(re.findall(r'\w{4,}', posting['description'].lower()))
+        posting['rank'] = len(cv_terms & job_terms)
+    return sorted(postings, key=lambda p: p['rank'], reverse=True)
+
+def google_search_fn(api_key, cx_id):
+    """Busca via Google Custom Search API para o polling; erros vão para o log e viram None."""
+    def search(query):
+        try:
+            from googleapiclient.discovery import build
+            service = build("customsearch", "v1", developerKey=api_key)
+            res = service.cse().list(q=query, cx=cx_id, num=10, sort='date').execute()
+            return res.get('items', [])
+        except Exception as e:
+            print(f"Erro na API do Google: {e}")
+            return None
+    return search
+
+def build_score_prompt(title, description, cv):
+    """Prompt curto que pede ao Gemini apenas a pontuação de match (0-100) de uma vaga."""
+    return f"""
+    **Tarefa:** Aja como um Tech Recruiter. Compare o currículo com a vaga e responda APENAS com a porcentagem de compatibilidade estimada (de 0% a 100%). Ex: 85%
+
+    **Currículo do Candidato:**
+    ---
+    {cv}
+    ---
+
+    **Descrição da Vaga:**
+    ---
+    Título: {title}
+    Conteúdo: {description}
+    ---
+    """
+
+def gemini_score_fn(api_key, cv, model_name="gemini-2.5-pro"):
+    """Pontuação de match via Gemini para o polling; erros vão para o log e viram None."""
+    def score(title, description):
+        try:
+            import google.generativeai as genai
+            genai.configure(api_key=api_key)
+            answer = genai.GenerativeModel(model_name).generate_content(build_score_prompt(title, description, cv)).text
+        except Exception as e:
+            print(f"Erro na API do Gemini: {e}")
+            return None
+        match = re.search(r'(\d{1,3})\s*%', answer or '')
+        return int(match.group(1)) if match else None
+    return score
+
+def poll_saved_search(search, search_fn, fetch_fn, cv=None, path=SAVED_SEARCHES_FILE):
+    """
+    Reexecuta uma busca salva e envia para scrape -> rank -> score apenas o delta:
+    vagas com URL canônica nunca vista ou cujo conteúdo mudou desde a última execução.
+
+    search_fn(query) devolve os itens do Google (None em caso de erro) e fetch_fn(url) o texto
+    da vaga (None se não deu para ler). O progresso é salvo a cada vaga, relendo o arquivo antes de cada escrita.
+    """
+    now = time.time()
+
+    results = search_fn(search['query'])
+    if results is None:
+        # Falha na API: não conta como execução, tenta de novo após POLL_RETRY_MINUTES
+        update_saved_searches(lambda d: _set_search_fields(d, search['id'], last_error=now), path)
+        return []
+
+    # 1. Diff barato pelo resultado da busca (título + snippet), antes de qualquer scrape.
+    # O snippet pode não refletir mudanças na página, então vagas lidas há mais de
+    # CONTENT_RECHECK_HOURS são relidas e comparadas pelo hash do conteúdo.
+    seen = load_saved_searches(path)['seen']
+    delta = []
+    for r in results:
+        if not r.get('link'):
+            continue
+        canonical = canonicalize_url(r['link'])
+        result_hash = content_hash(r.get('title'), r.get('snippet'))
+        entry = seen.get(canonical)
+        recently_read = entry and now - entry.get('last_seen', 0) < CONTENT_RECHECK_HOURS * 3600
+        if entry and entry.get('result_hash') == result_hash and recently_read:
+            continue
+        delta.append((canonical, result_hash, r, entry))
+
+    # 2. Scrape só do delta, confirmando a mudança pelo hash do conteúdo extraído
+    postings = []
+    for canonical, result_hash, r, entry in delta:
+        description = fetch_fn(r['link'])
+        if description is None:
+            continue  # Falha de leitura (bloqueio/timeout): não marca como vista, tenta de novo na próxima execução
+        description_hash = content_hash(description)
+        seen_entry = {
+            'result_hash': result_hash,
+            'content_hash': description_hash,
+            'search_id': search['id'],
+            'first_seen': entry.get('first_seen', now) if entry else now,
+            'last_seen': now,
+        }
+        if entry and entry.get('content_hash') == description_hash:
+            # Só o snippet mudou, a vaga é a mesma
+            update_saved_searches(lambda d: _record_posting(d, canonical, seen_entry), path)
+            continue
+        posting = {
+            'canonical': canonical,
+            'search_id': search['id'],
+            'status': 'alterada' if entry else 'nova',
+            'title': r.get('title'),
+            'link': r['link'],
+            'displayLink': r.get('displayLink'),
+            'snippet': r.get('snippet') or '',
+            'description': description,
+            'found_at': now,
+            'score': None,
+        }
+        postings.append(posting)
+        update_saved_searches(lambda d: _record_posting(d, canonical, seen_entry, posting), path)
+
+    # 3. Rank local (o score com IA fica para score_pending_feed, ao fim do polling)
+    postings = rank_by_cv(postings, cv)
+    new_canonicals = {p['canonical'] for p in postings}
+    def apply_ranking(d):
+        d['feed'] = (postings + [f for f in d['feed'] if f.get('canonical') not in new_canonicals])[:FEED_MAX_ITEMS]
+    update_saved_searches(apply_ranking, path)
+
+    update_saved_searches(lambda d: _set_search_fields(d, search['id'], last_run=now, last_error=None), path)
+    return postings
+
+def score_pending_feed(score_fn, path=SAVED_SEARCHES_FILE, limit=SAVED_SEARCH_MAX_SCORED):
+    """
+    Pontua com IA as vagas do feed ainda sem score (as melhores do ranking local primeiro),
+    inclusive as que ficaram pendentes por uma execução interrompida. Retorna quantas foram pontuadas.
+    """
+    feed = load_saved_searches(path)['feed']
+    pending = [f for f in feed if f.get('score') is None and f.get('score_attempts', 0) < SCORE_MAX_ATTEMPTS]
+    pending.sort(key=lambda f: f.get('rank', 0), reverse=True)
+    for item in pending[:limit]:
+        score = score_fn(item['title'], item['description'])
+        update_saved_searches(lambda d: _set_feed_score(d, item['canonical'], score), path)
+    return len(pending[:limit])
+
+def poll_due_searches(search_fn, fetch_fn, score_fn=None, cv=None, force=False, path=SAVED_SEARCHES_FILE):
+    """
+    Agendador: executa as buscas salvas cujo intervalo já venceu e pontua as novidades
+    com score_fn(title, description), se informado.
+    Retorna o total de novidades (None se nada rodou ou se outro polling já está em andamento).
+    """
+    if not _POLL_LOCK.acquire(blocking=False):
+        return None
+    try:
+        now = time.time()
+        total = None
+        for search in load_saved_searches(path)['searches']:
+            due = now - (search.get('last_run') or 0) >= search.get('interval_hours', 24) * 3600
+            backing_off = now - (search.get('last_error') or 0) < POLL_RETRY_MINUTES * 60
+            if force or (due and not backing_off):
+                total = (total or 0) + len(poll_saved_search(search, search_fn, fetch_fn, cv, path))
+        if score_fn:
+            score_pending_feed(score_fn, path)
+        return total
+    finally:
+        _POLL_LOCK.release()
+
+class SavedSearchWorker:
+    """
+    Thread única por processo que reexecuta as buscas salvas vencidas em segundo plano.
+    A página só informa chaves e currículo (configure) e lê o arquivo; nada de polling no thread da interface.
+    """
+
+    def __init__(self, fetch_fn, path=SAVED_SEARCHES_FILE, tick_seconds=POLL_TICK_SECONDS):
+        self.fetch_fn = fetch_fn
+        self.path = path
+        self.tick_seconds = tick_seconds
+        self.is_polling = False
+        self.last_result = None
+        self._settings = {}
+        self._force = False
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def configure(self, g_key, g_cx, gem_key=None, cv=None):
+        """Atualiza as credenciais e o currículo usados nas próximas verificações."""
+        was_configured = bool(self._settings)
+        self._settings = {'g_key': g_key, 'g_cx': g_cx, 'gem_key': gem_key, 'cv': cv}
+        if not was_configured:
+            self._wake.set()  # Primeira configuração: verifica já, sem esperar o próximo tick
+
+    def poll_now(self):
+        """Pede uma verificação imediata de todas as buscas, vencidas ou não."""
+        self._force = True
+        self._wake.set()
+
+    def poll_once(self, force=False):
+        settings = self._settings
+        if not (settings.get('g_key') and settings.get('g_cx')):
+            return None
+        score_fn = gemini_score_fn(settings['gem_key'], settings['cv']) if settings.get('gem_key') and settings.get('cv') else None
+        self.is_polling = True
+        try:
+            return poll_due_searches(
+                google_search_fn(settings['g_key'], settings['g_cx']), self.fetch_fn,
+                score_fn, settings.get('cv'), force, self.path,
+            )
+        finally:
+            self.is_polling = False
+
+    def _loop(self):
+        while True:
+            self._wake.wait(self.tick_seconds)
+            self._wake.clear()
+            force, self._force = self._force, False
+            try:
+                self.last_result = self.poll_once(force)
+            except Exception as e:
+                print(f"Polling das buscas salvas falhou: {e}")
+
+def main():
+    """Execução avulsa (Agendador de Tarefas/cron): verifica as buscas vencidas uma vez e sai."""
+    parser = argparse.ArgumentParser(description="Verifica as buscas salvas do Cognos Job e atualiza o feed de novidades.")
+    parser.add_argument("--cv", help="Arquivo texto com o currículo (habilita ranking e score com Gemini)")
+    parser.add_argument("--force", action="store_true", help="Verifica todas as buscas, mesmo as que não venceram")
+    args = parser.parse_args()
+
+    with open(KEYS_FILE, "r") as f:
+        keys = json.load(f)
+    cv = None
+    if args.cv:
+        with open(args.cv, "r", encoding="utf-8") as f:
+            cv = f.read()
+
+    from scraper import PLAYWRIGHT_AVAILABLE, BrowserRenderPool, fetch_job_text
+    render_pool = None
+    if PLAYWRIGHT_AVAILABLE:
+        try:
+            render_pool = BrowserRenderPool()
+        except Exception as e:
+            print(f"Renderizador local indisponível: {e}")
+    try:
+        score_fn = gemini_score_fn(keys['gem_key'], cv) if keys.get('gem_key') and cv else None
+        total = poll_due_searches(
+            google_search_fn(keys['g_key'], keys['g_cx']),
+            lambda url: fetch_job_text(url, render_pool),
+            score_fn, cv, args.force,
+        )
+        print(f"{total or 0} vaga(s) nova(s) ou alterada(s).")
+    finally:
+        if render_pool:
+            render_pool.close()
+
+if __name__ == "__main__":
+    main()
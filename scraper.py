@@ -0,0 +1,303 @@
+# Arquivo/Snippet [scraper.py]:
+# Extração do texto das vagas (requests -> Chromium headless local -> Jina), sem dependência do Streamlit
+import requests
+from bs4 import BeautifulSoup
+from urllib.parse import urlsplit
+# --- Imports para o Renderizador Local de JS ---
+import asyncio
+import concurrent.futures
+import threading
+# Dependência opcional: sem o Playwright o app segue com requests + Jina
+try:
+    from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+    PLAYWRIGHT_AVAILABLE = True
+except ImportError:
+    PLAYWRIGHT_AVAILABLE = False
+
+def clean_html_noise(soup):
+    """
+    Remove poluição visual com lógica baseada em CONTEÚDO, não só classes.
+    """
+    # 1. Remove tags estruturais inúteis para IA
+    for element in soup(['script', 'style', 'noscript', 'iframe', 'svg', 'header', 'footer', 'nav', 'aside', 'form', 'button']):
+        element.decompose()
+
+    # 2. COOKIE NUKE: Remove elementos que contenham texto de consentimento
+    # Isso resolve o problema do seu Print 1
+    blacklist_phrases = ['utilizamos cookies', 'sua privacidade', 'aceitar todos', 'política de privacidade', 'configurações de cookies']
+    
+    # Varre divs, sections e spans
+    for tag in soup.find_all(['div', 'section', 'span', 'p', 'aside']):
+        # Se o texto for curto (banner) e tiver palavras chave de cookie
+        text_content = tag.get_text(" ", strip=True).lower()
+        if len(text_content) < 400 and any(phrase in text_content for phrase in blacklist_phrases):
+            tag.decompose()
+
+    return soup
+
+# --- RENDERIZAÇÃO LOCAL DE JS (POOL DE CHROMIUM HEADLESS) ---
+# Regras por site:
+#   'wait_for': apenas o nó da descrição (a renderização espera por ele; nada genérico como 'main')
+#   'content': seletores para recortar o texto, do mais específico aos fallbacks
+SITE_RULES = {
+    'gupy.io': {
+        'wait_for': '[data-testid="text-section"]',
+        'content': '[data-testid="text-section"], [class*="description"], main',
+    },
+    'linkedin.com': {
+        'wait_for': '.show-more-less-html__markup',
+        'content': '.show-more-less-html__markup, .description__text, main',
+    },
+    'glassdoor.com.br': {
+        'wait_for': '[class*="JobDetails_jobDescription"]',
+        'content': '[class*="JobDetails_jobDescription"], .jobDescriptionContent, main',
+    },
+    'greenhouse.io': {
+        'wait_for': '.job__description',
+        'content': '.job__description, #content, main',
+    },
+    'lever.co': {
+        'wait_for': '.posting-page .section-wrapper',
+        'content': '.posting-page .section-wrapper, .posting-page, main',
+    },
+}
+DEFAULT_CONTENT_SELECTOR = 'main, article, [class*="description"], [id*="description"]'
+# Recursos que não trazem texto: bloqueados para acelerar a renderização
+BLOCKED_RESOURCE_TYPES = {'image', 'media', 'font'}
+TRACKER_HOSTS = (
+    'google-analytics.com', 'googletagmanager.com', 'doubleclick.net', 'facebook.net',
+    'hotjar.com', 'clarity.ms', 'segment.io', 'bat.bing.com', 'ads.linkedin.com',
+)
+RENDER_POOL_SIZE = 2  # Contextos aquecidos = limite de renderizações simultâneas
+RENDER_TIMEOUT_MS = 15000
+RENDER_START_TIMEOUT_MS = 30000  # Chromium travado na inicialização não pode prender a interface
+MIN_STATIC_TEXT = 150  # Abaixo disso o fetch estático é considerado uma "casca" de SPA
+
+def site_rule_for(url, rules=SITE_RULES):
+    """Retorna a regra do site (por domínio ou subdomínio) ou um dicionário vazio."""
+    host = (urlsplit(url).hostname or '').lower()
+    for domain, rule in rules.items():
+        if host == domain or host.endswith('.' + domain):
+            return rule
+    return {}
+
+def find_job_content(soup, url=None, rules=SITE_RULES):
+    """Encontra o bloco da vaga: seletores do site, depois containers genéricos, senão a página inteira."""
+    site_content = site_rule_for(url, rules).get('content') if url else None
+    selectors = [site_content] if site_content else []
+    selectors.append(DEFAULT_CONTENT_SELECTOR)
+    for selector in selectors:
+        for tag in soup.select(selector):
+            if len(tag.get_text(" ", strip=True)) > 200:
+                return tag
+    return soup.body or soup
+
+def extract_job_text(html, url=None, rules=SITE_RULES):
+    """Limpa o HTML (estático ou renderizado) e devolve apenas as linhas úteis da vaga."""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # 1. Limpa o lixo (Cookies, Menus)
+    soup = clean_html_noise(soup)
+
+    # 2. Encontra o bloco exato da vaga
+    content_block = find_job_content(soup, url, rules)
+
+    # 3. Formata o texto final
+    lines = []
+    for line in content_block.get_text("\n").splitlines():
+        clean_line = line.strip()
+        # Filtra linhas inúteis que sobraram
+        if len(clean_line) > 2 and clean_line.lower() not in ["aceitar", "fechar", "voltar"]:
+            lines.append(clean_line)
+
+    return "\n".join(lines)
+
+class BrowserRenderPool:
+    """
+    Pool de contextos Chromium headless mantidos aquecidos entre requisições.
+    Roda em uma thread própria com event loop asyncio, pois os objetos do
+    Playwright não podem ser compartilhados entre as threads de execução do Streamlit.
+    """
+
+    def __init__(self, size=RENDER_POOL_SIZE, site_rules=SITE_RULES, timeout_ms=RENDER_TIMEOUT_MS):
+        self.size = size
+        self.site_rules = site_rules
+        self.timeout_ms = timeout_ms
+        self._playwright = None
+        self._browser = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        try:
+            self._run(self._start(), timeout=RENDER_START_TIMEOUT_MS / 1000)
+        except Exception:
+            # Chromium ausente, travado ou com falha: encerra o driver e a thread do loop, sem deixar nada órfão
+            try:
+                self._run(self._shutdown(), timeout=RENDER_START_TIMEOUT_MS / 1000)
+            except Exception:
+                pass
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            raise
+
+    def _run(self, coro, timeout=None):
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()  # Não deixa a renderização rodando (e ocupando um contexto) após desistir
+            raise
+
+    async def _start(self):
+        self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(headless=True)
+        self._browser_lock = asyncio.Lock()
+        # A fila de contextos livres é o próprio limite de concorrência.
+        # None representa um slot vazio, recriado na próxima renderização.
+        self._contexts = asyncio.Queue()
+        for _ in range(self.size):
+            await self._contexts.put(await self._new_context())
+
+    async def _shutdown(self):
+        """Fecha o navegador (se ainda conectado) e o driver do Playwright."""
+        if self._browser and self._browser.is_connected():
+            await self._browser.close()
+        if self._playwright:
+            await self._playwright.stop()
+
+    async def _ensure_browser(self):
+        """Relança o Chromium se ele caiu ou foi desconectado."""
+        async with self._browser_lock:
+            if not self._browser.is_connected():
+                self._browser = await self._playwright.chromium.launch(headless=True)
+
+    async def _discard_context(self, context):
+        """Fecha um contexto possivelmente corrompido, ignorando erros (o navegador pode já ter caído)."""
+        if context is None:
+            return
+        try:
+            await context.close()
+        except Exception:
+            pass
+
+    async def _new_context(self):
+        await self._ensure_browser()
+        context = await self._browser.new_context(
+            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            locale='pt-BR',
+        )
+        await context.route("**/*", self._block_noise)
+        return context
+
+    @staticmethod
+    async def _block_noise(route):
+        """Aborta imagens, fontes, mídia e trackers; o resto segue normalmente."""
+        request = route.request
+        host = (urlsplit(request.url).hostname or '').lower()
+        if request.resource_type in BLOCKED_RESOURCE_TYPES or any(host == t or host.endswith('.' + t) for t in TRACKER_HOSTS):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _render(self, url):
+        context = await self._contexts.get()
+        try:
+            if context is None:
+                context = await self._new_context()
+            page = await context.new_page()
+            await page.goto(url, wait_until='domcontentloaded', timeout=self.timeout_ms)
+            wait_for = site_rule_for(url, self.site_rules).get('wait_for')
+            try:
+                if wait_for:
+                    await page.wait_for_selector(wait_for, timeout=self.timeout_ms)
+                else:
+                    # Sem regra para o site: espera a rede acalmar (XHRs da SPA)
+                    await page.wait_for_load_state('networkidle', timeout=self.timeout_ms)
+            except PlaywrightTimeoutError:
+                pass  # Usa o que já foi renderizado até aqui
+            html = await page.content()
+            await page.close()
+            await context.clear_cookies()
+            return html
+        except BaseException:
+            # Erro ou cancelamento: o contexto pode estar corrompido, então o slot fica vazio
+            await self._discard_context(context)
+            context = None
+            raise
+        finally:
+            await self._contexts.put(context)
+
+    def render(self, url):
+        """Renderiza a URL em um contexto do pool e devolve o HTML final (bloqueia até terminar)."""
+        # Margem para a espera na fila quando o pool está ocupado
+        return self._run(self._render(url), timeout=self.timeout_ms * 3 / 1000)
+
+    def close(self):
+        """Fecha o navegador e encerra a thread do event loop."""
+        self._run(self._shutdown())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+def fetch_job_text(url, render_pool=None, site_rules=SITE_RULES, use_jina=True):
+    """
+    Extração Híbrida v3.0 (sem cache):
+    Requests com headers Black + Limpeza Cirúrgica -> Se vier pouco texto -> Chromium headless local (pool) -> Jina.
+    O pool e as regras de site são injetados (a interface passa o pool compartilhado; os testes, um servidor local).
+    Retorna None se não foi possível extrair o texto.
+    """
+    extracted_text = ""
+    
+    # --- TENTATIVA 1: Lógica Manual Robustecida (Prioridade para limpeza local) ---
+    # Motivo: O Jina às vezes traz o banner de cookie renderizado. Nossa limpeza local é mais segura.
+    try:
+        # Headers anti-bloqueio (Black Edition)
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7',
+            'Upgrade-Insecure-Requests': '1',
+            'Sec-Fetch-Dest': 'document',
+            'Sec-Fetch-Mode': 'navigate',
+            'Sec-Fetch-Site': 'none',
+            'Sec-Fetch-User': '?1'
+        }
+        
+        response = requests.get(url, headers=headers, timeout=15)
+        
+        # Se der erro 403/401 (bloqueio), pula para o Jina
+        if response.status_code in [403, 401, 503]:
+            raise Exception("Bloqueio de WAF detectado")
+
+        response.encoding = response.apparent_encoding # Corrige acentuação
+        
+        extracted_text = extract_job_text(response.text, url, site_rules)
+
+    except Exception as e:
+        print(f"Método local falhou ou foi bloqueado: {e}. Tentando renderização...")
+        extracted_text = "" # Força fallback
+
+    # --- TENTATIVA 2: Renderização local de JS (casca de SPA ou bloqueio do fetch estático) ---
+    if len(extracted_text) < MIN_STATIC_TEXT and render_pool:
+        try:
+            extracted_text = extract_job_text(render_pool.render(url), url, render_pool.site_rules)
+        except Exception as e:
+            print(f"Renderização local falhou: {e}. Tentando Jina...")
+
+    # --- TENTATIVA 3: Fallback para Jina Reader (Se o local falhar) ---
+    if use_jina and (not extracted_text or len(extracted_text) < MIN_STATIC_TEXT):
+        try:
+            jina_url = f"https://r.jina.ai/{url}"
+            # Headers simples para o Jina
+            jheaders = {'User-Agent': 'Mozilla/5.0', 'X-Return-Format': 'markdown'}
+            r = requests.get(jina_url, headers=jheaders, timeout=20)
+            if r.status_code == 200:
+                # Mesmo com Jina, tentamos limpar banners comuns
+                raw_text = r.text
+                if "cookie" not in raw_text[:200].lower():
+                    extracted_text = raw_text
+        except:
+            pass
+
+    # Validação Final
+    if len(extracted_text) < 100:
+        return None
+        
+    return extracted_text
@@ -0,0 +1,200 @@
+# Arquivo/Snippet [tests/test_saved_searches.py]:
+# Testes do polling incremental das buscas salvas (Google, scraper e Gemini substituídos por stubs).
+# Rodar com: python -m pytest tests
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import saved_searches
+from saved_searches import (
+    canonicalize_url, content_hash, load_saved_searches, update_saved_searches,
+    poll_saved_search, poll_due_searches, SavedSearchWorker, CONTENT_RECHECK_HOURS, SAVED_SEARCH_MAX_SCORED,
+)
+
+JOB_URL = 'https://acme.gupy.io/jobs/1?utm_source=google'
+CV = "Desenvolvedor Python com experiência em Django e APIs REST"
+
+
+class Stubs:
+    """Google, scraper e Gemini falsos, contando as chamadas."""
+
+    def __init__(self):
+        self.results = [{'link': JOB_URL, 'title': 'Python Pleno', 'snippet': 'Vaga Python', 'displayLink': 'acme.gupy.io'}]
+        self.pages = {JOB_URL: "Vaga Python Django APIs REST " * 10}
+        self.fetched = []
+        self.scored = []
+
+    def search(self, query):
+        return self.results
+
+    def fetch(self, url):
+        self.fetched.append(url)
+        return self.pages.get(url)
+
+    def score(self, title, description):
+        self.scored.append(title)
+        return 80
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = str(tmp_path / "saved_searches.json")
+    update_saved_searches(lambda d: d['searches'].append({'id': 's1', 'query': 'q', 'interval_hours': 24, 'last_run': None}), path)
+    return path
+
+
+@pytest.fixture
+def stubs():
+    return Stubs()
+
+
+def poll(stubs, path, force=True):
+    return poll_due_searches(stubs.search, stubs.fetch, stubs.score, CV, force=force, path=path)
+
+
+def test_canonicalize_url_drops_tracking_and_noise():
+    assert canonicalize_url('HTTPS://Acme.Gupy.io/jobs/1/?jobBoardSource=gupy&utm_source=x#topo') == 'https://acme.gupy.io/jobs/1'
+    assert canonicalize_url('https://www.linkedin.com/jobs/view/42/?trackingId=a&refId=b&b=2&a=1') == 'https://www.linkedin.com/jobs/view/42?a=1&b=2'
+
+
+def test_content_hash_ignores_case_and_whitespace():
+    assert content_hash('Vaga  Python', 'Django') == content_hash('vaga python', ' django ')
+    assert content_hash('Vaga Python') != content_hash('Vaga Java')
+
+
+def test_new_posting_is_scraped_ranked_scored_and_fed(stubs, path):
+    assert poll(stubs, path) == 1
+    data = load_saved_searches(path)
+    assert list(data['seen']) == ['https://acme.gupy.io/jobs/1']
+    [item] = data['feed']
+    assert item['status'] == 'nova'
+    assert item['score'] == 80
+    assert item['rank'] > 0
+    assert data['searches'][0]['last_run']
+
+
+def test_unchanged_result_is_not_scraped_again(stubs, path):
+    poll(stubs, path)
+    assert poll(stubs, path) == 0
+    assert len(stubs.fetched) == 1
+    assert len(stubs.scored) == 1
+
+
+def test_snippet_only_change_does_not_reach_feed(stubs, path):
+    poll(stubs, path)
+    update_saved_searches(lambda d: d.update(feed=[]), path)
+    stubs.results[0]['snippet'] = 'Vaga Python (atualizada)'
+    assert poll(stubs, path) == 0
+    assert len(stubs.fetched) == 2
+    assert load_saved_searches(path)['feed'] == []
+
+
+def test_changed_content_is_fed_as_alterada(stubs, path):
+    poll(stubs, path)
+    stubs.results[0]['snippet'] = 'Vaga Python Sênior'
+    stubs.pages[JOB_URL] = "Vaga Python Sênior Django Kubernetes " * 10
+    assert poll(stubs, path) == 1
+    [item] = load_saved_searches(path)['feed']
+    assert item['status'] == 'alterada'
+
+
+def test_stale_posting_is_reread_even_with_same_snippet(stubs, path):
+    poll(stubs, path)
+    stubs.pages[JOB_URL] = "Vaga Python Sênior Django Kubernetes " * 10
+    # Dentro da janela de releitura o snippet igual evita o scrape
+    assert poll(stubs, path) == 0
+    assert len(stubs.fetched) == 1
+
+    def age_seen(d):
+        for entry in d['seen'].values():
+            entry['last_seen'] -= CONTENT_RECHECK_HOURS * 3600 + 1
+    update_saved_searches(age_seen, path)
+    assert poll(stubs, path) == 1
+    assert load_saved_searches(path)['feed'][0]['status'] == 'alterada'
+
+
+def test_pending_scores_are_completed_on_next_run(stubs, path):
+    poll_due_searches(stubs.search, stubs.fetch, None, CV, force=True, path=path)
+    assert load_saved_searches(path)['feed'][0]['score'] is None
+
+    # Próxima execução: nada novo para ler, mas a vaga pendente é pontuada
+    assert poll(stubs, path) == 0
+    assert len(stubs.fetched) == 1
+    assert load_saved_searches(path)['feed'][0]['score'] == 80
+
+
+def test_scoring_is_capped_per_run_and_per_posting(stubs, path):
+    stubs.results = [{'link': f'https://acme.gupy.io/jobs/{i}', 'title': f'Vaga {i}', 'snippet': 's'} for i in range(SAVED_SEARCH_MAX_SCORED + 2)]
+    stubs.pages = {r['link']: f"Vaga Python {i} " * 20 for i, r in enumerate(stubs.results)}
+    stubs.score = lambda title, description: stubs.scored.append(title)  # Gemini sem resposta válida
+    poll(stubs, path)
+    assert len(stubs.scored) == SAVED_SEARCH_MAX_SCORED
+    for _ in range(5):
+        poll(stubs, path)
+    # Cada vaga é tentada no máximo SCORE_MAX_ATTEMPTS vezes
+    assert len(stubs.scored) == len(stubs.results) * saved_searches.SCORE_MAX_ATTEMPTS
+
+
+def test_failed_scrape_is_not_marked_seen_and_is_retried(stubs, path):
+    stubs.pages[JOB_URL] = None
+    assert poll(stubs, path) == 0
+    data = load_saved_searches(path)
+    assert data['seen'] == {} and data['feed'] == []
+    assert stubs.scored == []
+
+    stubs.pages[JOB_URL] = "Vaga Python Django APIs REST " * 10
+    assert poll(stubs, path) == 1
+
+
+def test_api_failure_keeps_last_run_and_backs_off(stubs, path):
+    stubs.results = None
+    assert poll(stubs, path, force=False) == 0
+    search = load_saved_searches(path)['searches'][0]
+    assert search['last_run'] is None
+    assert 'last_error' in search
+    # Dentro da janela de espera a busca não roda de novo automaticamente
+    assert poll(stubs, path, force=False) is None
+
+
+def test_poll_keeps_changes_written_by_other_sessions(stubs, path):
+    def add_search_midway(url):
+        update_saved_searches(lambda d: d['searches'].append({'id': 's2', 'query': 'q2', 'interval_hours': 24, 'last_run': None}), path)
+        return Stubs.fetch(stubs, url)
+    stubs.fetch = add_search_midway
+    poll_saved_search({'id': 's1', 'query': 'q'}, stubs.search, stubs.fetch, path=path)
+    assert [s['id'] for s in load_saved_searches(path)['searches']] == ['s1', 's2']
+
+
+def test_corrupt_file_is_preserved_as_backup(path):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"searches": [{"id": "s1"')
+    data = load_saved_searches(path)
+    assert data['searches'] == []
+    assert not os.path.exists(path)
+    with open(f"{path}.bak", encoding="utf-8") as f:
+        assert f.read().startswith('{"searches"')
+
+
+def test_concurrent_poll_is_skipped(stubs, path):
+    with saved_searches._POLL_LOCK:
+        assert poll(stubs, path) is None
+    assert stubs.fetched == []
+
+
+def test_worker_polls_in_background_thread(stubs, path, monkeypatch):
+    monkeypatch.setattr(saved_searches, 'google_search_fn', lambda api_key, cx_id: stubs.search)
+    monkeypatch.setattr(saved_searches, 'gemini_score_fn', lambda api_key, cv: stubs.score)
+    worker = SavedSearchWorker(stubs.fetch, path=path, tick_seconds=3600)
+    # Sem chaves o worker não faz nada
+    assert worker.poll_once() is None
+
+    worker.configure('g_key', 'g_cx', 'gem_key', CV)
+    deadline = time.time() + 5
+    while not load_saved_searches(path)['feed'] and time.time() < deadline:
+        time.sleep(0.05)
+    [item] = load_saved_searches(path)['feed']
+    assert item['score'] == 80
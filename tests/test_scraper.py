@@ -0,0 +1,103 @@
+# Arquivo/Snippet [tests/test_scraper.py]:
+# Testes da extração contra um servidor local que só entrega a vaga via JavaScript.
+# Rodar com: python -m pytest tests
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# O scraper depende de requests + BeautifulSoup (requirements.txt); sem eles os testes são pulados
+pytest.importorskip("requests")
+pytest.importorskip("bs4")
+
+from scraper import PLAYWRIGHT_AVAILABLE, BrowserRenderPool, fetch_job_text
+
+JOB_TEXT = "Desenvolvedor Python Pleno. Responsabilidades: manter APIs em Django, escrever testes automatizados e revisar código do time."
+
+# Casca de SPA: <main> aparece na hora, a descrição só entra em #job depois de um atraso
+SHELL_HTML = f"""<!DOCTYPE html>
+<html><head><title>Vaga</title></head>
+<body>
+  <main><div id="job"></div></main>
+  <img src="/pixel.png">
+  <script>
+    setTimeout(function () {{
+      document.getElementById('job').innerHTML = '<h1>Vaga</h1><p>{JOB_TEXT}</p><ul><li>{JOB_TEXT}</li></ul>';
+    }}, 800);
+  </script>
+</body></html>"""
+
+FIXTURE_RULES = {'127.0.0.1': {'wait_for': '#job p', 'content': '#job'}}
+
+
+class ShellHandler(BaseHTTPRequestHandler):
+    requested_paths = []
+
+    def do_GET(self):
+        ShellHandler.requested_paths.append(self.path)
+        body = SHELL_HTML.encode('utf-8') if self.path == '/vaga' else b''
+        self.send_response(200 if self.path == '/vaga' else 404)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def shell_url():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ShellHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/vaga"
+    server.shutdown()
+
+
+@pytest.fixture(scope="module")
+def render_pool():
+    if not PLAYWRIGHT_AVAILABLE:
+        pytest.skip("Playwright não instalado")
+    try:
+        pool = BrowserRenderPool(size=1, site_rules=FIXTURE_RULES)
+    except Exception as e:
+        pytest.skip(f"Chromium indisponível: {e}")
+    yield pool
+    pool.close()
+
+
+def test_static_fetch_of_spa_shell_has_no_text(shell_url):
+    assert fetch_job_text(shell_url, site_rules=FIXTURE_RULES, use_jina=False) is None
+
+
+def test_render_pool_extracts_js_rendered_job(shell_url, render_pool):
+    ShellHandler.requested_paths.clear()
+    text = fetch_job_text(shell_url, render_pool, FIXTURE_RULES, use_jina=False)
+    assert text is not None
+    assert JOB_TEXT in text
+    # Imagens são bloqueadas antes de sair do navegador
+    assert '/pixel.png' not in ShellHandler.requested_paths
+
+
+def pooled_context_ids(render_pool):
+    """Contextos livres no pool (lidos direto da fila; None seria um slot descartado)."""
+    contexts = list(render_pool._contexts._queue)
+    assert None not in contexts
+    assert len(contexts) == render_pool.size
+    return sorted(id(context) for context in contexts)
+
+
+def test_render_pool_is_reused_across_requests(shell_url, render_pool):
+    contexts_before = pooled_context_ids(render_pool)
+    first = fetch_job_text(shell_url, render_pool, FIXTURE_RULES, use_jina=False)
+    second = fetch_job_text(shell_url, render_pool, FIXTURE_RULES, use_jina=False)
+    assert first is not None
+    assert JOB_TEXT in first
+    assert second == first
+    # Os mesmos contextos aquecidos voltam para o pool: nenhum foi descartado ou recriado
+    assert pooled_context_ids(render_pool) == contexts_before